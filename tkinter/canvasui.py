@@ -1,52 +1,53 @@
 import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
-from collections.abc import Iterable, Callable
+from collections.abc import Callable
 import numpy as np
 
 DEFAULT_WIDTH=3
 DEFAULT_COLOR="red"
-
-def isArray(x):
-	return isinstance(x, Iterable)
+PHOTO_CACHE_SIZE=4
 
 def process_nested_locs(xy, func, *args, **kwargs):
-	"""Recursively processes nested location data using a specified function.
+	"""Processes nested location data with a specified function in a single vectorized call.
 	Args:
 		xy (list or np.ndarray): Nested list or numpy array representing location data.
 	Can be in either [x, y] or [x, y, w, h] format.
-		func (function): The function to be applied to each location.
+		func (function): The function to be applied to the locations. It receives all of them
+	at once as a float array whose last axis holds [x, y] or [x, y, w, h].
 		*args: Additional positional arguments for the function.
 		**kwargs: Additional keyword arguments for the function.
 		
 	Returns:
-		 list or np.ndarray: A new nested list or numpy array with the same structure as the input 'xy',
+		 list or np.ndarray: A new numpy array with the same shape as the input 'xy',
                             where each original location has been replaced by the result of `func`.
-                            The type of the returned object (list or ndarray) will match the
-                            input type.
+                            Unset locations (None entries) are returned unchanged; input mixing
+                            set and unset locations is processed per element and returned as a list.
 	"""
 	if xy is None:
 		return xy
-	if isArray(xy[0]):
+	try:
+		arr=np.asarray(xy)
+	except ValueError:
+		# ragged, e.g. a line with one unset end
+		arr=None
+	if arr is None or arr.dtype==object:
+		if all(e is None for e in xy):
+			return xy
 		return [process_nested_locs(e, func, *args, **kwargs) for e in xy]
-	if len(xy)>999:
-		rb=[xy[0]+xy[2], xy[1]+xy[3]]
-		xys=(xy[:2],rb)
-		res = [e for sub in process_nested_locs(xys, func,*args, **kwargs) for e in sub]
-		wh=[res[2]-res[0], res[3]-res[1]]
-		return res[:2] + wh
-	return func(xy, *args, **kwargs)
+	return func(arr.astype(np.float64, copy=False), *args, **kwargs)
 
 def for_nested_locs(func):
-	"""A decorator that applies a function recursively to nested location data.
+	"""A decorator that applies a function to nested location data.
 
     This decorator wraps a function and enables it to process nested lists or NumPy arrays
-    containing location data. The decorated function will be called on each individual,
-    non-nested location array (e.g., [x, y] or [x, y, w, h]). The decorator handles
-    the traversal of the nested structure, simplifying the logic of the wrapped function.
+    containing location data. The decorated function will be called once with every
+    location in a single float array (last axis [x, y] or [x, y, w, h]). The decorator handles
+    the conversion of the nested structure, simplifying the logic of the wrapped function.
+    Callers that already hold a float ndarray can call the undecorated function directly.
 
     Args:
-        func (function): The function to be decorated. It should accept a single location array as its first argument, followed by any additional positional or keyword arguments.
+        func (function): The function to be decorated. It should accept a location array of any leading shape as its first argument, followed by any additional positional or keyword arguments.
 
     Returns:
         function: The decorated function.
@@ -56,24 +57,21 @@ def for_nested_locs(func):
 		return process_nested_locs(xy, func, *args, **kwargs)
 	return wrapper
 
-@for_nested_locs
 def rounds(xy):
-	return np.round(xy).astype(int)
-
-@for_nested_locs
-def shiftscale(xywh_or_xy, shift, scale):
-	p=xywh_or_xy
-	if p is None or p[0] is None:
-		return p
-	res=np.array(p).reshape(-1, 2)
-	if isArray(shift):
-		shift=np.array(shift)[None]
-		if len(res)>=2:
-			shift=np.concatenate((shift, shift*0))
-	if isArray(scale):
-		scale=np.array(scale)[None]
-	res=(res+shift)*scale
-	return res.flatten()
+	"""Rounds a whole (possibly nested) coordinate array to integers in one pass."""
+	return np.rint(np.asarray(xy)).astype(np.int32)
+
+def _affine(xywh_or_xy, M, out=None):
+	p=xywh_or_xy.reshape(xywh_or_xy.shape[:-1]+(-1, 2))
+	if out is None:
+		out=np.empty(xywh_or_xy.shape)
+	res=out.reshape(p.shape)
+	np.matmul(p, M[:2, :2].T, out=res)
+	# translate positions only, [w, h] halves are scaled
+	np.add(res[..., 0, :], M[:2, 2], out=res[..., 0, :])
+	return out
+
+affine=for_nested_locs(_affine)
 
 def get_normalized_coord_func(obj:tk.Widget):
 	"""Returns a function to normalize mouse event coordinates based on a Tkinter widget.
@@ -92,6 +90,8 @@ def get_normalized_coord_func(obj:tk.Widget):
                   and returns a NumPy array containing the normalized coordinates [x_norm, y_norm].
     """
 	def wh():
+		if hasattr(obj, "_wh"):
+			return obj._wh
 		if hasattr(obj, "winfo_width"):
 			return np.array((obj.winfo_width(), obj.winfo_height()))
 		return obj.getSize()
@@ -116,12 +116,8 @@ def get_closest_point(xy1, xy2):
         np.ndarray: A 2D NumPy array representing the new point.
 	"""
 	swh=xy2-xy1
-	wh=np.abs(swh)
-	# distance
-	whmin=np.min(wh)
-	# direction
-	sgns=np.sign(swh)
-	return xy1+sgns*whmin
+	# direction * distance
+	return xy1+np.sign(swh)*np.min(np.abs(swh))
 
 class Motion:
 	"""Manages mouse events to track state and position, and execute callbacks.
@@ -147,16 +143,25 @@ class Motion:
 		self.callbk=callbk
 		self.posNormalizer=posNormalizer
 		self.lack_aspect_ratio=False
+		self._pending=None
+		self._scheduled=False
+		self._buf=np.empty(2)
 	
 	def runCallbk(self, edpos, mode):
+		if self.callbk is None or self.stpos is None:
+			return
 		if hasattr(edpos, "x"):
-			edpos=np.array((edpos.x, edpos.y))
-		if self.callbk is not None and self.stpos is not None:
-			stpos=self.stpos
-			if self.lack_aspect_ratio:
-				edpos=get_closest_point(self.stpos_raw, edpos)
-			edpos=self.normalize(edpos)
-			self.callbk(stpos, edpos, mode)
+			# reuse the scratch buffer; normalize() below returns a new array
+			self._buf[0]=edpos.x
+			self._buf[1]=edpos.y
+			edpos=self._buf
+		stpos=self.stpos
+		if self.lack_aspect_ratio:
+			edpos=get_closest_point(self.stpos_raw, edpos)
+		edpos=self.normalize(edpos)
+		if edpos is self._buf:
+			edpos=edpos.copy()
+		self.callbk(stpos, edpos, mode)
 	
 	def normalize(self, xy):
 		if self.posNormalizer is None:
@@ -174,23 +179,69 @@ class Motion:
 		self.runCallbk(self.stpos_raw, self.MOTION_ST)
 
 	def mov(self, e):
-		self.runCallbk(e, self.MOTION_MV)
+		# coalesce drag events: only the latest one is handled once Tk is idle
+		self._pending=e
+		if not self._scheduled:
+			self._scheduled=True
+			e.widget.after_idle(self._flush)
+	
+	def _flush(self):
+		e=self._pending
+		self._pending=None
+		self._scheduled=False
+		if e is not None:
+			self.runCallbk(e, self.MOTION_MV)
 	
 	def end(self, e):
+		self._pending=None
 		self.runCallbk(e, self.MOTION_ED)
 		self.stpos=None
 
 class RectHelper:
-	"""A utility class for flexible rectangle manipulation."""
+	"""A utility class for flexible rectangle manipulation.
+
+	The rectangle is stored as a single [l, t, r, b] array; the center `xy` and size `wh`
+	are derived from it and either of them can be unset (None) independently.
+	"""
 	def __init__(self, xy=None, wh=None):
+		self._ltrb=np.zeros(4)
+		self._hasXy=False
+		self._hasWh=False
 		self.xy=xy
 		self.wh=wh
 
+	@property
+	def xy(self):
+		if not self._hasXy:
+			return None
+		return (self._ltrb[:2]+self._ltrb[2:])/2
+
+	@xy.setter
+	def xy(self, xy):
+		self._hasXy=xy is not None
+		if self._hasXy:
+			wh=self._ltrb[2:]-self._ltrb[:2]
+			self._ltrb[:2]=xy-wh/2
+			self._ltrb[2:]=self._ltrb[:2]+wh
+
+	@property
+	def wh(self):
+		if not self._hasWh:
+			return None
+		return self._ltrb[2:]-self._ltrb[:2]
+
+	@wh.setter
+	def wh(self, wh):
+		self._hasWh=wh is not None
+		if self._hasWh:
+			ct=(self._ltrb[:2]+self._ltrb[2:])/2
+			self._ltrb[:2]=ct-np.asarray(wh)/2
+			self._ltrb[2:]=self._ltrb[:2]+wh
+
 	def setByPoints(self, xy1, xy2):
-		lt=np.minimum(xy1, xy2)
-		rb=np.maximum(xy1, xy2)
-		self.xy=(lt+rb)/2
-		self.wh=rb-lt
+		self._ltrb[:2]=np.minimum(xy1, xy2)
+		self._ltrb[2:]=np.maximum(xy1, xy2)
+		self._hasXy=self._hasWh=True
 	
 	def setByCtSide(self, ct, xy):
 		dxy=np.abs(xy-ct)
@@ -201,19 +252,20 @@ class RectHelper:
 		self.wh=wh
 	
 	def setByRefer(self, referRect):
-		self.xy=referRect.xy
-		self.wh=referRect.wh
+		self._ltrb[:]=referRect._ltrb
+		self._hasXy=referRect._hasXy
+		self._hasWh=referRect._hasWh
 	
 	def setByAuto(self, xy1, xy2):
-		if self.xy is None and self.wh is None:
+		if not self._hasXy and not self._hasWh:
 			self.setByPoints(xy1, xy2)
-		elif self.xy is None:
+		elif not self._hasXy:
 			self.xy=xy2
-		elif self.wh is None:
+		elif not self._hasWh:
 			self.setByCtSide(self.xy, xy2)
 	
 	def isValid(self):
-		return self.xy is not None and self.wh is not None
+		return self._hasXy and self._hasWh
 
 class RectModifier(RectHelper):
 	"""A class to modify a rectangle's position or size based on mouse events.
@@ -235,9 +287,7 @@ class RectModifier(RectHelper):
 	
 	@staticmethod
 	def getModeList():
-		dct=__class__.__dict__
-		lst=[(k, v) for k, v in dct.items() if k.startswith("MODE_")]
-		return lst
+		return __class__._MODE_LIST
 
 	def reload(self, st, ed, mode):
 		self.setByRefer(self.lastDecide)
@@ -250,39 +300,41 @@ class RectModifier(RectHelper):
 			self.lastDecide.setByRefer(self)
 	
 	def getLtrb(self):
-		if self.xy is None or self.wh is None:
+		if not self.isValid():
 			return None
-		lt=self.xy-self.wh/2
-		rb=lt+self.wh
-		return np.concatenate((lt, rb))
-
-def drawCross(obj:tk.Canvas, xy, width=DEFAULT_WIDTH, clr=DEFAULT_COLOR):
-	sz=obj.winfo_width()//30
-	xv, yv=np.eye(2)*sz
-	ln1=np.stack((xy-xv, xy+xv))
-	ln2=np.stack((xy-yv, xy+yv))
-	lines=rounds((ln1, ln2))
-	for ln in lines:
-		obj.create_line(*ln[0],*ln[1], fill=clr, width=width, tags="drawing")
-
-def drawLine(obj:tk.Canvas, xy1, xy2, width=DEFAULT_WIDTH, clr=DEFAULT_COLOR):
-	obj.create_line(*rounds(xy1), *rounds(xy2), fill=clr, width=width, tags="drawing")
-
-def drawBox(obj:tk.Canvas, ltrb, width=DEFAULT_WIDTH, clr=DEFAULT_COLOR):
-	ltrb=rounds(ltrb)
-	obj.create_rectangle(*ltrb, width=width, outline=clr, tags="drawing")
-
-def ratio2Obj(obj:tk.Widget, *args):
-	w=obj.winfo_width()
-	h=obj.winfo_height()
-	wh=np.array((w,h))
-	ress=[]
-	for arg in args:
-		res=[]
-		xys=arg.reshape(-1, 2)
-		res=(xys*wh[None]).flatten()
-		ress.append(res)
-	return ress
+		return self._ltrb
+
+RectModifier._MODE_LIST=[(k, v) for k, v in vars(RectModifier).items() if k.startswith("MODE_")]
+
+def drawCross(obj:tk.Canvas, xy, sz, width=DEFAULT_WIDTH, clr=DEFAULT_COLOR, items=None):
+	x, y=int(round(xy[0])), int(round(xy[1]))
+	sz=int(sz)
+	lines=((x-sz, y, x+sz, y), (x, y-sz, x, y+sz))
+	if items is None:
+		return tuple(obj.create_line(*ln, fill=clr, width=width, tags="drawing") for ln in lines)
+	obj.coords(items[0], *lines[0])
+	obj.coords(items[1], *lines[1])
+	return items
+
+def drawLine(obj:tk.Canvas, xy1, xy2, width=DEFAULT_WIDTH, clr=DEFAULT_COLOR, item=None):
+	xys=rounds(np.stack((xy1, xy2))).tolist()
+	if item is None:
+		return obj.create_line(*xys[0], *xys[1], fill=clr, width=width, tags="drawing")
+	obj.coords(item, *xys[0], *xys[1])
+	return item
+
+def drawBox(obj:tk.Canvas, ltrb, width=DEFAULT_WIDTH, clr=DEFAULT_COLOR, item=None):
+	ltrb=rounds(ltrb).tolist()
+	if item is None:
+		return obj.create_rectangle(*ltrb, width=width, outline=clr, tags="drawing")
+	obj.coords(item, *ltrb)
+	return item
+
+def ratio2Obj(wh, *args):
+	arrs=[np.asarray(arg).reshape(-1, 2) for arg in args]
+	sizes=[len(arr) for arr in arrs]
+	xys=np.concatenate(arrs)*wh
+	return np.split(xys.reshape(-1), np.cumsum(sizes[:-1])*2)
 
 class InteractiveShapeModifier:
 	"""Modifies the position or dimensions of a shape based on mouse events and a specified mode."""
@@ -293,6 +345,20 @@ class InteractiveShapeModifier:
 		self.mode=self.MODE_POS
 		self.rctctl=RectModifier()
 		self.xys=None
+		self.reset()
+	
+	def reset(self):
+		"""Forgets the canvas items drawn so far, e.g. after they were deleted from the canvas."""
+		self._crossIds=None
+		self._lineId=None
+		self._boxId=None
+		self._shownIds=set()
+		self._lastKey=None
+	
+	def getItemIds(self):
+		ids=list(self._crossIds or ())
+		ids+=[i for i in (self._lineId, self._boxId) if i is not None]
+		return ids
 	
 	def setRect(self, xywh):
 		self.mode=self.MODE_BOX
@@ -340,18 +406,41 @@ class InteractiveShapeModifier:
 		if self.isBox():
 			self.rctctl.reload(st, ed, mode)
 	
-	def draw(self, obj:tk.Canvas):
-		obj.delete("drawing")
-		if self.xys is not None:
-			xys=ratio2Obj(obj, *self.xys)
-			if self.isPos():
-				drawCross(obj, xys[0])
-			if self.isLine():
-				drawLine(obj, *xys)
-		if self.isBox() and self.rctctl.isValid():
-			ltrb=self.rctctl.getLtrb()
-			ltrb=ratio2Obj(obj, ltrb)[0]
-			drawBox(obj, ltrb)
+	def draw(self, obj:tk.Canvas, wh, crossSz):
+		if self.isBox():
+			xys=ratio2Obj(wh, self.rctctl.getLtrb()) if self.rctctl.isValid() else []
+		elif self.xys is not None:
+			xys=ratio2Obj(wh, *self.xys)
+		else:
+			xys=[]
+		# skip the canvas update when the shape lands on the same pixels
+		key=(self.mode, crossSz, tuple(rounds(np.concatenate(xys)).tolist()) if xys else ())
+		if key==self._lastKey:
+			return
+		self._lastKey=key
+		shown=set()
+		if xys and self.isPos():
+			self._crossIds=drawCross(obj, xys[0], crossSz, items=self._crossIds)
+			shown.update(self._crossIds)
+		if xys and self.isLine():
+			self._lineId=drawLine(obj, *xys, item=self._lineId)
+			shown.add(self._lineId)
+		if xys and self.isBox():
+			self._boxId=drawBox(obj, xys[0], item=self._boxId)
+			shown.add(self._boxId)
+		self._setShown(obj, shown)
+	
+	def clear(self, obj:tk.Canvas):
+		self._lastKey=None
+		self._setShown(obj, set())
+	
+	def _setShown(self, obj:tk.Canvas, ids):
+		# items are kept and only hidden, so the next draw just moves them
+		for item in self._shownIds-ids:
+			obj.itemconfigure(item, state="hidden")
+		for item in ids-self._shownIds:
+			obj.itemconfigure(item, state="normal")
+		self._shownIds=ids
 
 class ImageFitter:
 	"""Manages image display and coordinate conversion within a canvas.
@@ -371,6 +460,7 @@ class ImageFitter:
 	def __init__(self, im, obj:tk.Canvas):
 		self.orgim=im
 		self.img=None
+		self._photos={}
 		self.obj=obj
 		self.toTk()
 	
@@ -392,108 +482,96 @@ class ImageFitter:
 		asp_wh=wh/orgwh
 		asp=np.min(asp_wh)
 		nwh=np.floor(orgwh*asp)
-		nwh=np.maximum(nwh, 1)
-		im=self.orgim.resize(nwh.astype(int))
-		self.img=ImageTk.PhotoImage(im)
+		nwh=np.maximum(nwh, 1).astype(int)
+		key=tuple(nwh.tolist())
+		if key not in self._photos:
+			if len(self._photos)>=PHOTO_CACHE_SIZE:
+				del self._photos[next(iter(self._photos))]
+			self._photos[key]=ImageTk.PhotoImage(self._resize(key))
+		self.img=self._photos[key]
 		ltpos=(wh-nwh)//2
 		self.ltwh=np.concatenate((ltpos, nwh)).astype(int)
+		self.updateTransforms()
+	
+	def _resize(self, wh):
+		im=self.orgim
+		if im.format=="JPEG" and im.tile and isinstance(im.filename, str) and im.filename:
+			# not decoded yet: draft a throwaway handle so orgim keeps its full resolution
+			with Image.open(im.filename) as src:
+				src.draft("RGB", wh)
+				return src.resize(wh, Image.Resampling.BILINEAR)
+		return im.resize(wh, Image.Resampling.BILINEAR)
+	
+	def updateTransforms(self):
+		"""Precomputes the 3x3 affine matrices of every coordinate conversion.
+
+		Must be called again whenever the client size or the drawn image area changes.
+		"""
+		refsz, imltwh, orgwh=self.getSizes()
+		lt, imwh=imltwh[:2], imltwh[2:]
+		# client ratio -> client pixel
+		self._client=np.diag((*refsz, 1.))
+		shift=np.eye(3)
+		shift[:2, 2]=-lt
+		# client pixel -> each coordinate system
+		self._to={
+			__class__.COORD_CLIENT: np.eye(3),
+			__class__.COORD_CVS: shift,
+			__class__.COORD_IMRATIO: np.diag((*(1/imwh), 1.))@shift,
+			__class__.COORD_ORG: np.diag((*(orgwh/imwh), 1.))@shift,
+		}
+		# each coordinate system -> client ratio
+		self._from={k: np.linalg.inv(M@self._client) for k, M in self._to.items()}
 	
 	def putImage(self, tags):
 		self.obj.create_image(self.ltwh[0], self.ltwh[1], anchor=tk.NW, image=self.img, tags=tags)
 
 	@staticmethod
 	@for_nested_locs
-	def _getClientPosAt(xy, refsz):
-		return np.round(shiftscale(xy, 0, refsz))
+	def _getPosAt(xy, client, M, rnd):
+		xy=_affine(xy, client)
+		np.round(xy, out=xy)
+		_affine(xy, M, out=xy)
+		if rnd:
+			np.round(xy, out=xy)
+		return xy
 	
 	def getClientPosAt(self, xy):
-		return self._getClientPosAt(xy, self.getClientSize())
-
-	@staticmethod
-	@for_nested_locs
-	def _getImRatioAt(xy, refsz, imltwh):
-		xy=__class__._getClientPosAt(xy, refsz)
-		dxy=shiftscale(xy, -imltwh[:2], 1/imltwh[2:])
-		return dxy
+		return self.getPosAt(xy, __class__.COORD_CLIENT)
 	
 	def getImRatioAt(self, xy):
-		return self._getImRatioAt(xy, self.getClientSize(), self.getDrawLtwh())
-
-	@staticmethod
-	@for_nested_locs
-	def _getImCvsPosAt(xy, refsz, imltwh):
-		xy=__class__._getClientPosAt(xy, refsz)
-		dxy=shiftscale(xy, -imltwh[:2], 1)
-		return np.round(dxy)
+		return self.getPosAt(xy, __class__.COORD_IMRATIO)
 	
 	def getImCvsPosAt(self, xy):
-		return self._getImCvsPosAt(xy, self.getClientSize(), self.getDrawLtwh())
-
-	@staticmethod
-	@for_nested_locs
-	def _getImOrgPosAt(xy, refsz, imltwh, orgwh):
-		xy=__class__._getClientPosAt(xy, refsz)
-		dxy=shiftscale(xy, -imltwh[:2], orgwh/imltwh[2:])
-		return np.round(dxy)
+		return self.getPosAt(xy, __class__.COORD_CVS)
 	
 	def getImOrgPosAt(self, xy):
-		return self._getImOrgPosAt(xy, *self.getSizes())
-
-	@staticmethod
-	@for_nested_locs
-	def _getFromClientPos(xy, refsz):
-		return shiftscale(xy, 0, 1/refsz)
-
+		return self.getPosAt(xy, __class__.COORD_ORG)
+	
 	def getFromClientPos(self, xy):
-		return self._getFromClientPos(xy, self.getClientSize())
-
-	@staticmethod
-	@for_nested_locs
-	def _getFromImCvsPos(xy, refsz, imltwh, orgwh):
-		return shiftscale(xy, imltwh[:2], 1/refsz)
+		return self.getFromPos(xy, __class__.COORD_CLIENT)
 	
 	def getFromCvsPos(self, xy):
-		return self._getFromImCvsPos(xy, *self.getSizes())
-
-	@staticmethod
-	@for_nested_locs
-	def _getFromImOrgPos(xy, refsz, imltwh, orgwh):
-		return shiftscale(xy, imltwh[:2]/imltwh[2:]*orgwh, imltwh[2:]/orgwh/refsz)
+		return self.getFromPos(xy, __class__.COORD_CVS)
 	
 	def getFromImOrgPos(self, xy):
-		return self._getFromImOrgPos(xy, *self.getSizes())
-	
-	@staticmethod
-	@for_nested_locs
-	def _getFromImRatio(xy, refsz, imltwh, orgwh):
-		print(imltwh, refsz)
-		return shiftscale(xy, imltwh[:2]/imltwh[2:], imltwh[2:]/refsz)
+		return self.getFromPos(xy, __class__.COORD_ORG)
 	
 	def getFromImRatio(self, xy):
-		return self._getFromImRatio(xy, *self.getSizes())
+		return self.getFromPos(xy, __class__.COORD_IMRATIO)
 	
 	def getPosAt(self, xy, geokind):
-		f={
-			__class__.COORD_CLIENT: self.getClientPosAt,
-			__class__.COORD_CVS: self.getImCvsPosAt,
-			__class__.COORD_IMRATIO: self.getImRatioAt,
-			__class__.COORD_ORG: self.getImOrgPosAt,
-			__class__.COORD_RAW: lambda p:p
-		}
-		assert(geokind in f)
-		return f[geokind](xy)
+		if geokind==__class__.COORD_RAW:
+			return xy
+		assert(geokind in self._to)
+		rnd=geokind!=__class__.COORD_IMRATIO
+		return self._getPosAt(xy, self._client, self._to[geokind], rnd)
 	
 	def getFromPos(self, xy, geokind):
-		f={
-			__class__.COORD_CLIENT: self.getFromClientPos,
-			__class__.COORD_CVS: self.getFromCvsPos,
-			__class__.COORD_IMRATIO: self.getFromImRatio,
-			__class__.COORD_ORG: self.getFromImOrgPos,
-			__class__.COORD_RAW: lambda p:np.array(p)
-		}
-		assert(geokind in f)
-		print(xy, f[geokind](xy))
-		return f[geokind](xy)
+		if geokind==__class__.COORD_RAW:
+			return np.array(xy)
+		assert(geokind in self._from)
+		return affine(xy, self._from[geokind])
 
 class InteractiveShapeCanvas(tk.Canvas):
 	"""A Tkinter canvas subclass for interactive shape creation and manipulation
@@ -516,11 +594,27 @@ class InteractiveShapeCanvas(tk.Canvas):
 		self.onSel=None
 		self.root=root
 		self.coordMode=ImageFitter.COORD_IMRATIO
+		self._wh=np.array((self.winfo_width(), self.winfo_height()))
+		self._crossSz=self._wh[0]//30
+		# private bindtag, so a user's own bind("<Configure>", ...) can't replace this handler
+		sizetag="ShapeCanvasSize"+str(self)
+		self.bind_class(sizetag, "<Configure>", self.onConfigure)
+		self.bindtags((sizetag,)+self.bindtags())
+
+	def onConfigure(self, e):
+		self._wh=np.array((e.width, e.height))
+		self._crossSz=e.width//30
+		if self.imfit is not None:
+			# refit the image; sizes seen before reuse their cached PhotoImage
+			self.imfit.toTk()
+			self.delete("srcim")
+			self.imfit.putImage("srcim")
+			self.tag_raise("drawing")
+			self.posctl.draw(self, self._wh, self._crossSz)
 
 	def onMouse(self, st, ed, mode):
-		self.delete("drawing")
 		self.posctl.setMouse(st,ed,mode)
-		self.posctl.draw(self)
+		self.posctl.draw(self, self._wh, self._crossSz)
 		if self.onSel:
 			pos=self.imfit.getPosAt(self.posctl.getPos(), self.coordMode)
 			self.onSel(pos, self.posctl)
@@ -548,6 +642,14 @@ class InteractiveShapeCanvas(tk.Canvas):
 			pos=self.imfit.getPosAt(pos, self.coordMode)
 		return pos
 	
+	def delete(self, *args):
+		super().delete(*args)
+		# user code may delete the shape items too, e.g. delete("drawing") or delete("all")
+		ids=self.posctl.getItemIds()
+		if not all(self.type(item) for item in ids):
+			self.posctl.reset()
+			super().delete(*ids)
+	
 	def setWhFix(self, onoff):
 		self.mt.bwheq=onoff
 	
@@ -557,13 +659,17 @@ class InteractiveShapeCanvas(tk.Canvas):
 		if self.img is not None:
 			del self.img
 		if isinstance(imc, str):
-			im=Image.open(imc)
-		elif isinstance(imc, tuple):
-			im=Image.new("RGB", size=imc[:2], color=imc[2])
+			# release the file once fitted; JPEG drafts reopen it by name
+			with Image.open(imc) as im:
+				self.imfit = ImageFitter(im, self)
 		else:
-			im=imc
-		self.imfit = ImageFitter(im, self)
+			if isinstance(imc, tuple):
+				im=Image.new("RGB", size=imc[:2], color=imc[2])
+			else:
+				im=imc
+			self.imfit = ImageFitter(im, self)
 		self.imfit.putImage("srcim")
+		self.tag_raise("drawing")
 
 
 if __name__=="__main__":
@@ -581,8 +687,8 @@ if __name__=="__main__":
 	def wheq(poses, mode):
 		if mode != InteractiveShapeModifier.MODE_BOX:
 			return poses
-		wh=ratio2Obj(canvas, *poses)[1]
-		wh=[min(*wh)]*2
+		wh=ratio2Obj(canvas._wh, *poses)[1]
+		wh=np.full(2, np.min(wh))
 		wh=get_normalized_coord_func(canvas)(wh)
 		return poses[0], wh
 	root.mainloop()